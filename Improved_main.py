@@ -1,10 +1,62 @@
 import cv2
+import numpy as np
+import os
+import sys
 import time
+import queue
+import threading
 from improved_hand_detector import ImprovedHandDetector
 
+def put_latest(q, item):
+    """Put item on a bounded queue, dropping the oldest entry if it is full"""
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
+
+def build_static_overlay(shape):
+    """Draw the parts of the UI that never change once, returning the overlay and its mask"""
+    overlay = np.zeros(shape, dtype=np.uint8)
+    
+    # Circle behind the finger count
+    cv2.circle(overlay, (50, 50), 40, (255, 0, 0), cv2.FILLED)
+    
+    # Instructions
+    cv2.putText(overlay, "Press 'l' to freeze/unfreeze background", 
+               (10, shape[0] - 60), cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 255), 1)
+    cv2.putText(overlay, "Press 'r' to reset background", 
+               (10, shape[0] - 40), cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 255), 1)
+    cv2.putText(overlay, "Press 's' to adjust skin thresholds", 
+               (10, shape[0] - 20), cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 255), 1)
+    cv2.putText(overlay, "Press 'q' to quit", 
+               (10, shape[0] - 5), cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 255), 1)
+    
+    return overlay, overlay.any(axis=2, keepdims=True)
+
+def report_cpu_features():
+    """Enable OpenCV's optimized code paths and print the SIMD levels it was built with"""
+    cv2.setUseOptimized(True)
+    for line in cv2.getBuildInformation().splitlines():
+        line = line.strip()
+        if line.startswith(("Baseline:", "Dispatched code generation:")):
+            print(f"OpenCV CPU {line}")
+
 def main():
-    # Initialize webcam
-    cap = cv2.VideoCapture(0)
+    # Make sure OpenCV uses its SIMD (universal intrinsics) code paths
+    report_cpu_features()
+    
+    # Pin OpenCV's worker pool to about half the cores, leaving headroom for
+    # the capture and detection threads
+    cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
+    print(f"OpenCV threads: {cv2.getNumThreads()}")
+    
+    # Initialize webcam (V4L2 directly on Linux, default backend elsewhere)
+    backend = cv2.CAP_V4L2 if sys.platform.startswith('linux') else cv2.CAP_ANY
+    cap = cv2.VideoCapture(0, backend)
     
     # Check if the webcam is opened correctly
     if not cap.isOpened():
@@ -15,12 +67,22 @@ def main():
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
     
+    # Ask for MJPG frames (cheaper to transfer than raw YUYV on USB webcams)
+    # and a one-frame driver buffer so reads always return the latest frame.
+    # Cameras that don't support a setting simply ignore it.
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    cap.set(cv2.CAP_PROP_FPS, 60)
+    
     # Initialize improved hand detector
     detector = ImprovedHandDetector()
     
     # Variables for FPS calculation
     prev_time = 0
-    current_time = 0
+    
+    # Static UI layer, built on the first displayed frame
+    static_overlay = None
+    static_mask = None
     
     # Initial delay for setup
     print("Setting up background model. Please keep your hand out of view for a few seconds...")
@@ -39,50 +101,119 @@ def main():
             print(f"Calibrating: {progress}% complete", end='\r')
             
     print("\nCalibration complete! You can now show your hand.")
-    print("Press 'r' to reset background model, 'q' to quit.")
+    print("Press 'r' to reset background model, 'l' to freeze/unfreeze it, 'q' to quit.")
     
-    # Main loop
-    while True:
-        # Capture frame-by-frame
-        success, frame = cap.read()
-        if not success:
-            print("Error: Failed to grab frame.")
-            break
-        
-        # Flip the frame horizontally for a more intuitive selfie-view
-        frame = cv2.flip(frame, 1)
-        
-        # Process frame to detect hand and count fingers
-        processed_frame = detector.detect_hand(frame)
-        
-        # Get finger count
-        finger_count = detector.get_finger_count()
-        
-        # Calculate FPS
-        current_time = time.time()
-        fps = 1 / (current_time - prev_time) if (current_time - prev_time) != 0 else 0
-        prev_time = current_time
-        
-        # Display results on the frame
-        # Draw finger count in a circle
-        cv2.circle(processed_frame, (50, 50), 40, (255, 0, 0), cv2.FILLED)
-        cv2.putText(processed_frame, str(finger_count), (40, 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        
-        # Display FPS
-        cv2.putText(processed_frame, f"FPS: {int(fps)}", (10, 30), 
-                   cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 255), 2)
-        
-        # Display instructions
-        cv2.putText(processed_frame, "Press 'r' to reset background", 
-                   (10, processed_frame.shape[0] - 40), cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 255), 1)
-        cv2.putText(processed_frame, "Press 's' to adjust skin thresholds", 
-                   (10, processed_frame.shape[0] - 20), cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 255), 1)
-        cv2.putText(processed_frame, "Press 'q' to quit", 
-                   (10, processed_frame.shape[0] - 5), cv2.FONT_HERSHEY_PLAIN, 1, (0, 255, 255), 1)
+    # Once calibrated, let the background model adapt slowly (0 freezes it)
+    steady_learning_rate = 0.001
+    detector.learning_rate = steady_learning_rate
+    
+    # Pipeline: capture thread -> detection thread -> display (main thread).
+    # Bounded queues with a drop-oldest policy keep latency low, so each frame
+    # costs max(stage) instead of the sum of all stages.
+    frame_queue = queue.Queue(maxsize=2)
+    result_queue = queue.Queue(maxsize=2)
+    stop_event = threading.Event()
+    reset_event = threading.Event()
+    freeze_event = threading.Event()
+    
+    def next_frame():
+        """Block until a captured frame is available (None once stopping)"""
+        while not stop_event.is_set():
+            try:
+                return frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+    
+    def grabber():
+        # Stop the whole pipeline if this thread exits for any reason
+        try:
+            while not stop_event.is_set():
+                # Capture frame-by-frame
+                success, frame = cap.read()
+                if not success:
+                    print("Error: Failed to grab frame.")
+                    break
+                
+                # Flip the frame horizontally for a more intuitive selfie-view
+                put_latest(frame_queue, cv2.flip(frame, 1))
+        finally:
+            stop_event.set()
+    
+    def detector_worker():
+        nonlocal steady_learning_rate
+        # Stop the whole pipeline if this thread exits for any reason (e.g. an error
+        # in detect_hand), so the main loop doesn't wait on an empty queue forever
+        try:
+            while not stop_event.is_set():
+                frame = next_frame()
+                if frame is None:
+                    break
+                
+                if freeze_event.is_set():
+                    # Toggle between a frozen and a slowly adapting background model
+                    freeze_event.clear()
+                    steady_learning_rate = 0.001 if steady_learning_rate == 0 else 0
+                    detector.learning_rate = steady_learning_rate
+                    print("Background model " + ("frozen." if steady_learning_rate == 0 else "adapting slowly."))
+                
+                if reset_event.is_set():
+                    # Reset background model and warm up the new model
+                    detector.reset()
+                    print("Resetting background model. Please keep your hand out of view for a few seconds...")
+                    time.sleep(1)
+                    for _ in range(20):
+                        frame = next_frame()
+                        if frame is None:
+                            return
+                        _ = detector.detect_hand(frame, draw=False)
+                    detector.learning_rate = steady_learning_rate
+                    reset_event.clear()
+                    print("Reset complete!")
+                    continue
+                
+                # Process frame to detect hand and count fingers
+                processed_frame = detector.detect_hand(frame)
+                
+                # Hand the frame over together with its finger count
+                put_latest(result_queue, (processed_frame, detector.get_finger_count()))
+        finally:
+            stop_event.set()
+    
+    threads = [threading.Thread(target=grabber, daemon=True),
+               threading.Thread(target=detector_worker, daemon=True)]
+    for thread in threads:
+        thread.start()
+    
+    # Main loop (display and key handling stay on the main thread)
+    while not stop_event.is_set():
+        try:
+            processed_frame, finger_count = result_queue.get(timeout=0.01)
+        except queue.Empty:
+            processed_frame = None
         
-        # Display the resulting frame
-        cv2.imshow('Improved Hand Digit Recognizer', processed_frame)
+        if processed_frame is not None:
+            # Calculate FPS
+            current_time = time.time()
+            fps = 1 / (current_time - prev_time) if (current_time - prev_time) != 0 else 0
+            prev_time = current_time
+            
+            # Display results on the frame
+            # Copy in the static UI (count circle and instructions)
+            if static_overlay is None or static_overlay.shape != processed_frame.shape:
+                static_overlay, static_mask = build_static_overlay(processed_frame.shape)
+            np.copyto(processed_frame, static_overlay, where=static_mask)
+            
+            # Draw finger count in the circle
+            cv2.putText(processed_frame, str(finger_count), (40, 60), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            
+            # Display FPS
+            cv2.putText(processed_frame, f"FPS: {int(fps)}", (10, 30), 
+                       cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 255), 2)
+            
+            # Display the resulting frame
+            cv2.imshow('Improved Hand Digit Recognizer', processed_frame)
         
         # Process key presses
         key = cv2.waitKey(1) & 0xFF
@@ -90,22 +221,22 @@ def main():
             # Exit on 'q' press
             break
         elif key == ord('r'):
-            # Reset background model on 'r' press
-            detector.reset()
-            # Warm up the new model
-            print("Resetting background model. Please keep your hand out of view for a few seconds...")
-            time.sleep(1)
-            for _ in range(20):
-                success, frame = cap.read()
-                if success:
-                    frame = cv2.flip(frame, 1)
-                    _ = detector.detect_hand(frame, draw=False)
-            print("Reset complete!")
+            # Reset background model on 'r' press (handled by the detection thread)
+            reset_event.set()
+        elif key == ord('l'):
+            # Freeze/unfreeze background model on 'l' press (handled by the detection thread)
+            freeze_event.set()
         elif key == ord('s'):
             # Placeholder for skin threshold adjustment if needed
             # In a full application, this would open a trackbar window
             print("Skin threshold adjustment not implemented in this demo.")
     
+    # Stop the pipeline threads, waiting for them to finish so the camera
+    # isn't released while a read is still in progress
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+    
     # Release resources
     cap.release()
     cv2.destroyAllWindows()
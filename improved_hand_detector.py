@@ -8,6 +8,10 @@ class ImprovedHandDetector:
     and better finger counting logic.
     """
     def __init__(self):
+        # Detection runs on frames downscaled by this factor; results are
+        # scaled back to full-frame coordinates for drawing
+        self.scale = 2
+        
         # Kernels for morphological operations
         self.kernel_small = np.ones((3, 3), np.uint8)
         self.kernel_medium = np.ones((5, 5), np.uint8)
@@ -15,6 +19,9 @@ class ImprovedHandDetector:
         
         # Background subtractor
         self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(history=500, varThreshold=25, detectShadows=False)
+        # MOG2 learning rate: -1 lets OpenCV choose it (used while calibrating);
+        # a small value slows the per-pixel model updates once calibrated
+        self.learning_rate = -1
         
         # Color ranges for skin detection in YCrCb space
         # These ranges can be adjusted based on different skin tones
@@ -32,34 +39,80 @@ class ImprovedHandDetector:
         
         # History for stabilization
         self.history_length = 5
-        self.count_history = [0] * self.history_length
+        self.count_history = np.zeros(self.history_length, dtype=np.int32)
         self.history_index = 0
         
+        # Motion gate: while a detected hand stays still, reuse the last
+        # detection for up to max_skip_frames frames instead of re-running it
+        # (only after calibration, like the static-scene gate below)
+        self.motion_threshold = 2.0  # Mean absolute gray-level change in the ROI
+        self.max_skip_frames = 3
+        self.frames_since_detect = 0
+        self.prev_gray = None
+        
+        # Static-scene gate: when no part of the frame changed since the masks
+        # were last computed, skip MOG2 and reuse the last combined mask.
+        # Only active after calibration (learning_rate set to a steady value)
+        # and once the background model has seen min_bg_frames frames.
+        self.static_scene_threshold = 2.0  # Max mean gray-level change per 16x16 block
+        self.min_bg_frames = 20
+        self.bg_frames = 0
+        self.combined_mask = None
+        self.mask_origin = (0, 0)  # Top-left of the combined mask in the downscaled frame
+        self.mask_gray = None  # Gray frame the combined mask was computed from
+        
+        # Search region: once a hand is found, only the area around it (padded
+        # by roi_padding full-frame pixels) is searched in later frames, with a
+        # full-frame search every full_search_interval frames to re-acquire
+        self.roi_padding = 60
+        self.full_search_interval = 15
+        self.frames_since_full_search = 0
+        
+        # Per-frame work buffers, reused across frames (see _buffer)
+        self._buffers = {}
+        
     def reset(self):
         """Reset the detector state"""
         self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(history=500, varThreshold=25, detectShadows=False)
+        self.learning_rate = -1
+        self.prev_gray = None  # Force a full detection on the next frame
+        self.mask_gray = None
+        self.bg_frames = 0
         print("Background model reset. Please wait a moment for calibration...")
     
+    def _buffer(self, name, shape, dtype=np.uint8):
+        """Return a reusable work buffer (a view when smaller), reallocating it only when it is too small"""
+        buf = self._buffers.get(name)
+        if (buf is None or buf.dtype != dtype or buf.shape[2:] != shape[2:]
+                or buf.shape[0] < shape[0] or buf.shape[1] < shape[1]):
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+        return buf[:shape[0], :shape[1]]
+    
     def _get_skin_mask(self, frame):
         """Extract skin regions using color thresholding in YCrCb color space"""
         # Convert to YCrCb color space
-        ycrcb = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
+        ycrcb = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb, dst=self._buffer('ycrcb', frame.shape))
         
         # Create a mask for skin color
-        skin_mask = cv2.inRange(ycrcb, self.lower_skin, self.upper_skin)
+        skin_mask = cv2.inRange(ycrcb, self.lower_skin, self.upper_skin,
+                                dst=self._buffer('skin', frame.shape[:2]))
         
-        # Apply morphological operations to clean up the mask
-        skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_OPEN, self.kernel_small)
-        skin_mask = cv2.morphologyEx(skin_mask, cv2.MORPH_CLOSE, self.kernel_medium)
-        skin_mask = cv2.dilate(skin_mask, self.kernel_small, iterations=1)
+        # Apply morphological operations to clean up the mask (in place)
+        cv2.morphologyEx(skin_mask, cv2.MORPH_OPEN, self.kernel_small, dst=skin_mask)
+        cv2.morphologyEx(skin_mask, cv2.MORPH_CLOSE, self.kernel_medium, dst=skin_mask)
+        cv2.dilate(skin_mask, self.kernel_small, dst=skin_mask, iterations=1)
         
         return skin_mask
     
-    def _get_largest_contour(self, mask, min_area=5000):
+    def _get_largest_contour(self, mask, min_area=5000, offset=(0, 0)):
         """Find the largest contour in the mask that's likely to be a hand"""
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Teh-Chin approximation gives fewer points than CHAIN_APPROX_SIMPLE,
+        # which speeds up the hull and defect analysis downstream
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_KCOS, offset=offset)
         
-        # Filter contours by area
+        # Filter contours by area (min_area is in full-frame pixels)
+        min_area = min_area / self.scale**2
         large_contours = [cnt for cnt in contours if cv2.contourArea(cnt) > min_area]
         
         if not large_contours:
@@ -69,25 +122,27 @@ class ImprovedHandDetector:
         return max(large_contours, key=cv2.contourArea)
     
     def _get_defects_and_hull(self, contour):
-        """Get convexity defects and hull for the contour"""
+        """Get convexity defects, hull indices and hull points for the contour"""
         if contour is None or len(contour) < 5:  # Need at least 5 points for meaningful defects
-            return None, None
+            return None, None, None
         
-        # Get the convex hull
+        # Get the convex hull once, as indices, and look up its points from the contour
         hull = cv2.convexHull(contour, returnPoints=False)
+        hull_points = contour[hull[:, 0], 0, :]
         
         # Get convexity defects
         try:
             defects = cv2.convexityDefects(contour, hull)
-            return defects, hull
+            return defects, hull, hull_points
         except:
-            return None, hull
+            return None, hull, hull_points
     
-    def _find_fingertips(self, contour, defects, frame_shape):
+    def _find_fingertips(self, contour, defects, hull_points, frame_shape):
         """
-        Find fingertips using contour, convexity defects, and distance from center.
+        Find fingertips using the convex hull and distance from center.
         Returns list of fingertip coordinates and count.
         """
+        # The convexity defects only gate detection: without them there is no hand
         if contour is None or defects is None:
             return [], 0
         
@@ -104,74 +159,36 @@ class ImprovedHandDetector:
         x, y, w, h = cv2.boundingRect(contour)
         self.roi = (x, y, w, h)
         
-        # Filter defects to find finger valleys
-        finger_valleys = []
-        for i in range(defects.shape[0]):
-            s, e, f, d = defects[i, 0]
-            start = tuple(contour[s][0])
-            end = tuple(contour[e][0])
-            far = tuple(contour[f][0])
-            
-            # Calculate the triangle sides
-            a = math.dist(far, start)
-            b = math.dist(far, end)
-            c = math.dist(start, end)
-            
-            # Calculate angle using cosine law
-            if a*b == 0:  # Avoid division by zero
-                continue
-                
-            angle = math.degrees(math.acos((a**2 + b**2 - c**2) / (2*a*b)))
-            
-            # Filter based on angle and distance
-            if angle < 90 and d/256.0 > 10:  # d is scaled by 256 in OpenCV
-                finger_valleys.append((start, end, far))
-        
-        # Find potential fingertips
-        # Convert to contour format for easier processing
-        cnt_array = np.array(contour).reshape((-1, 2))
-        
-        # Get the hull in point form for fingertip detection
-        hull_points = cv2.convexHull(contour, returnPoints=True)
-        hull_points = np.array([p[0] for p in hull_points])
+        # Find potential fingertips using the distance of every hull point
+        # from the center, computed in one pass
+        min_dist = math.sqrt(frame_shape[0]**2 + frame_shape[1]**2) * 0.05  # 5% of diagonal
+        hull_dx = hull_points[:, 0] - cx
+        hull_dist = np.hypot(hull_dx, hull_points[:, 1] - cy)
+        far_enough = hull_dist > min_dist
         
         # Candidate fingertips are convex points that are:
         # 1. At the top of the hand (y-coordinate smaller than center)
         # 2. Far enough from the center
         # 3. Part of the convex hull
-        fingertips = []
-        min_dist = math.sqrt(frame_shape[0]**2 + frame_shape[1]**2) * 0.05  # 5% of diagonal
-        
-        for point in hull_points:
-            # Check if point is above center of hand
-            if point[1] < cy:  # Y-axis points down
-                # Check distance from center
-                distance = math.dist(point, (cx, cy))
-                if distance > min_dist:
-                    fingertips.append(tuple(point))
+        is_tip = far_enough & (hull_points[:, 1] < cy)  # Y-axis points down
+        tip_indices = np.flatnonzero(is_tip)
         
         # Special case: check for thumb which might be to the side
-        # Look for points to the left/right that have large difference from center
-        thumb_candidates = []
-        for point in hull_points:
-            # Check if point is significantly to the left or right of center
-            if abs(point[0] - cx) > w * 0.25:  # At least 25% of width away
-                distance = math.dist(point, (cx, cy))
-                if distance > min_dist:
-                    thumb_candidates.append((tuple(point), distance))
-        
-        # Add thumb if found (point with largest distance)
-        if thumb_candidates:
-            thumb_candidates.sort(key=lambda x: x[1], reverse=True)
-            thumb_point = thumb_candidates[0][0]
-            if thumb_point not in fingertips:
-                fingertips.append(thumb_point)
+        # Look for points at least 25% of the width left/right of center and
+        # add the one with the largest distance
+        is_side = far_enough & (np.abs(hull_dx) > w * 0.25)
+        if is_side.any():
+            side_indices = np.flatnonzero(is_side)
+            thumb_index = side_indices[hull_dist[side_indices].argmax()]
+            if not is_tip[thumb_index]:
+                tip_indices = np.append(tip_indices, thumb_index)
         
         # Cap at 5 fingers maximum (choose farthest points if more are found)
-        if len(fingertips) > 5:
-            fingertips_with_dist = [(p, math.dist(p, (cx, cy))) for p in fingertips]
-            fingertips_with_dist.sort(key=lambda x: x[1], reverse=True)
-            fingertips = [p[0] for p in fingertips_with_dist[:5]]
+        if len(tip_indices) > 5:
+            order = np.argsort(-hull_dist[tip_indices], kind='stable')
+            tip_indices = tip_indices[order[:5]]
+        
+        fingertips = [tuple(p) for p in hull_points[tip_indices].tolist()]
         
         return fingertips, len(fingertips)
     
@@ -181,13 +198,70 @@ class ImprovedHandDetector:
         self.count_history[self.history_index] = count
         self.history_index = (self.history_index + 1) % self.history_length
         
-        # Use mode for stabilization
-        counts = {}
-        for c in self.count_history:
-            counts[c] = counts.get(c, 0) + 1
-        
-        # Return most frequent count
-        return max(counts.items(), key=lambda x: x[1])[0]
+        # Return most frequent count (mode of the history, ties go to the lower count)
+        return int(np.bincount(self.count_history, minlength=6).argmax())
+    
+    def _get_search_region(self, shape):
+        """Return the (x0, y0, x1, y1) region of the downscaled frame to search for the hand"""
+        h, w = shape
+        self.frames_since_full_search += 1
+        if self.hand_contour is None or self.frames_since_full_search >= self.full_search_interval:
+            self.frames_since_full_search = 0
+            return 0, 0, w, h
+        
+        # Pad the last hand's bounding box (in downscaled coordinates)
+        x, y, bw, bh = (v // self.scale for v in cv2.boundingRect(self.hand_contour))
+        pad = self.roi_padding // self.scale
+        return max(0, x - pad), max(0, y - pad), min(w, x + bw + pad), min(h, y + bh + pad)
+    
+    def _is_hand_static(self, gray):
+        """Check whether the last detected hand barely moved since the previous frame"""
+        # Keep training MOG2 on every frame while calibrating (learning_rate -1)
+        if (self.learning_rate < 0 or self.hand_contour is None or self.prev_gray is None
+                or self.prev_gray.shape != gray.shape
+                or self.frames_since_detect >= self.max_skip_frames):
+            return False
+        
+        # Mean frame difference over the hand's bounding box (in downscaled coordinates)
+        x, y, w, h = (v // self.scale for v in cv2.boundingRect(self.hand_contour))
+        motion = cv2.absdiff(gray[y:y+h, x:x+w], self.prev_gray[y:y+h, x:x+w]).mean()
+        return motion < self.motion_threshold
+    
+    def _is_scene_static(self, gray):
+        """Check whether no part of the frame changed since the masks were last computed"""
+        # Keep training MOG2 on every frame while calibrating (learning_rate -1)
+        if (self.learning_rate < 0 or self.bg_frames < self.min_bg_frames or self.mask_gray is None
+                or self.mask_gray.shape != gray.shape):
+            return False
+        
+        # Compare per-block means so a small moving hand isn't averaged away
+        diff = cv2.absdiff(gray, self.mask_gray, dst=self._buffer('diff', gray.shape))
+        blocks = cv2.resize(diff, (gray.shape[1] // 16, gray.shape[0] // 16), interpolation=cv2.INTER_AREA)
+        return blocks.max() < self.static_scene_threshold
+    
+    def _draw_hand(self, result_frame):
+        """Draw the current hand contour, fingertips and count on the frame"""
+        # Draw hand contour
+        cv2.drawContours(result_frame, [self.hand_contour], 0, (0, 255, 0), 2)
+        
+        # Draw hand center
+        if self.hand_center:
+            cv2.circle(result_frame, self.hand_center, 5, (0, 0, 255), -1)
+        
+        # Draw fingertips
+        for fingertip in self.finger_tips:
+            cv2.circle(result_frame, fingertip, 8, (255, 0, 0), -1)
+        
+        # Draw ROI if available
+        if self.roi:
+            x, y, w, h = self.roi
+            cv2.rectangle(result_frame, (x, y), (x+w, y+h), (0, 255, 255), 2)
+        
+        # Draw finger count text near the hand
+        if self.hand_center:
+            cx, cy = self.hand_center
+            cv2.putText(result_frame, f"Count: {self.finger_count}", 
+                       (cx - 50, cy + 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 0), 2)
     
     def detect_hand(self, frame, draw=True):
         """
@@ -201,59 +275,77 @@ class ImprovedHandDetector:
             Processed frame with visualizations if draw=True
             Updates finger_count property with current count
         """
-        # Make a copy of the frame for drawing
+        # Make a copy of the frame for drawing (not a reused buffer, since the
+        # caller may still be displaying the previous result)
         result_frame = frame.copy()
         h, w = frame.shape[:2]
         
-        # Step 1: Apply background subtraction
-        fg_mask = self.bg_subtractor.apply(frame)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self.kernel_small)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, self.kernel_medium)
-        
-        # Step 2: Get skin color mask
-        skin_mask = self._get_skin_mask(frame)
-        
-        # Step 3: Combine the masks
-        combined_mask = cv2.bitwise_and(fg_mask, skin_mask)
-        combined_mask = cv2.dilate(combined_mask, self.kernel_medium, iterations=1)
+        # Run the per-pixel stages on a downscaled frame
+        small_shape = (h // self.scale, w // self.scale)
+        small = cv2.resize(frame, small_shape[::-1], dst=self._buffer('small', small_shape + frame.shape[2:]),
+                           interpolation=cv2.INTER_AREA)
+        
+        # Step 0: Reuse the previous detection while the hand is not moving
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._buffer('gray', small_shape))
+        hand_static = self._is_hand_static(gray)
+        # Swap buffers: the next frame is converted into the old previous frame
+        self._buffers['gray'], self.prev_gray = self.prev_gray, gray
+        if hand_static:
+            self.frames_since_detect += 1
+            if draw:
+                self._draw_hand(result_frame)
+            return result_frame
+        self.frames_since_detect = 0
         
-        # Step 4: Find the largest contour (hand)
-        self.hand_contour = self._get_largest_contour(combined_mask)
+        if self._is_scene_static(gray):
+            # Nothing moved: skip steps 1-3 and reuse the last combined mask
+            combined_mask = self.combined_mask
+        else:
+            # Step 1: Apply background subtraction (always on the whole frame,
+            # so the background model stays consistent)
+            fg_mask = self.bg_subtractor.apply(small, fgmask=self._buffer('fg', small_shape),
+                                               learningRate=self.learning_rate)
+            self.bg_frames += 1
+            
+            # The remaining per-pixel work only covers the search region
+            x0, y0, x1, y1 = self._get_search_region(small_shape)
+            region_shape = (y1 - y0, x1 - x0)
+            fg_mask = fg_mask[y0:y1, x0:x1]
+            cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self.kernel_small, dst=fg_mask)
+            cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, self.kernel_medium, dst=fg_mask)
+            
+            # Step 2: Get skin color mask
+            skin_mask = self._get_skin_mask(small[y0:y1, x0:x1])
+            
+            # Step 3: Combine the masks and dilate the result in place
+            combined_mask = cv2.bitwise_and(fg_mask, skin_mask, dst=self._buffer('combined', region_shape))
+            cv2.dilate(combined_mask, self.kernel_medium, dst=combined_mask, iterations=1)
+            
+            # Remember the mask and the frame it came from for the static-scene gate
+            self.combined_mask = combined_mask
+            self.mask_origin = (x0, y0)
+            self.mask_gray = self._buffer('mask_gray', small_shape)
+            np.copyto(self.mask_gray, gray)
+        
+        # Step 4: Find the largest contour (hand) and scale it back to full-frame coordinates
+        self.hand_contour = self._get_largest_contour(combined_mask, offset=self.mask_origin)
+        if self.hand_contour is not None:
+            self.hand_contour = self.hand_contour * self.scale
         
         # Step 5: Process the hand contour if found
         if self.hand_contour is not None:
             # Get defects and hull
-            defects, hull = self._get_defects_and_hull(self.hand_contour)
+            defects, hull, hull_points = self._get_defects_and_hull(self.hand_contour)
             
             # Find fingertips
-            self.finger_tips, raw_count = self._find_fingertips(self.hand_contour, defects, frame.shape)
+            self.finger_tips, raw_count = self._find_fingertips(self.hand_contour, defects, hull_points, frame.shape)
             
             # Stabilize the count
             self.finger_count = self._stabilize_count(raw_count)
             
             # Draw visualizations if requested
             if draw:
-                # Draw hand contour
-                cv2.drawContours(result_frame, [self.hand_contour], 0, (0, 255, 0), 2)
-                
-                # Draw hand center
-                if self.hand_center:
-                    cv2.circle(result_frame, self.hand_center, 5, (0, 0, 255), -1)
-                
-                # Draw fingertips
-                for fingertip in self.finger_tips:
-                    cv2.circle(result_frame, fingertip, 8, (255, 0, 0), -1)
-                
-                # Draw ROI if available
-                if self.roi:
-                    x, y, w, h = self.roi
-                    cv2.rectangle(result_frame, (x, y), (x+w, y+h), (0, 255, 255), 2)
-                
-                # Draw finger count text near the hand
-                if self.hand_center:
-                    cx, cy = self.hand_center
-                    cv2.putText(result_frame, f"Count: {self.finger_count}", 
-                               (cx - 50, cy + 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 0), 2)
+                self._draw_hand(result_frame)
         else:
             # No hand detected
             self.finger_count = 0
@@ -0,0 +1,90 @@
+import math
+import unittest
+
+import cv2
+import numpy as np
+
+from improved_hand_detector import ImprovedHandDetector
+
+
+def reference_fingertips(contour, frame_shape):
+    """Original point-by-point fingertip selection, kept to check the vectorized version"""
+    moments = cv2.moments(contour)
+    if moments['m00'] == 0:
+        return []
+    cx = int(moments['m10'] / moments['m00'])
+    cy = int(moments['m01'] / moments['m00'])
+    x, y, w, h = cv2.boundingRect(contour)
+    
+    hull_points = cv2.convexHull(contour, returnPoints=True)
+    hull_points = np.array([p[0] for p in hull_points])
+    
+    fingertips = []
+    min_dist = math.sqrt(frame_shape[0]**2 + frame_shape[1]**2) * 0.05
+    for point in hull_points:
+        if point[1] < cy:
+            distance = math.dist(point, (cx, cy))
+            if distance > min_dist:
+                fingertips.append(tuple(point))
+    
+    thumb_candidates = []
+    for point in hull_points:
+        if abs(point[0] - cx) > w * 0.25:
+            distance = math.dist(point, (cx, cy))
+            if distance > min_dist:
+                thumb_candidates.append((tuple(point), distance))
+    
+    if thumb_candidates:
+        thumb_candidates.sort(key=lambda x: x[1], reverse=True)
+        thumb_point = thumb_candidates[0][0]
+        if thumb_point not in fingertips:
+            fingertips.append(thumb_point)
+    
+    if len(fingertips) > 5:
+        fingertips_with_dist = [(p, math.dist(p, (cx, cy))) for p in fingertips]
+        fingertips_with_dist.sort(key=lambda x: x[1], reverse=True)
+        fingertips = [p[0] for p in fingertips_with_dist[:5]]
+    
+    return [tuple(int(v) for v in p) for p in fingertips]
+
+
+def random_contour(rng, shape):
+    """Largest contour of a random star-shaped polygon drawn into a mask"""
+    h, w = shape
+    n = rng.integers(5, 24)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+    radii = rng.uniform(20, min(h, w) * 0.45, n)
+    center = rng.uniform([w * 0.3, h * 0.3], [w * 0.7, h * 0.7])
+    points = (center + np.stack([np.cos(angles), np.sin(angles)], axis=1) * radii[:, None]).astype(np.int32)
+    mask = np.zeros(shape, dtype=np.uint8)
+    cv2.fillPoly(mask, [points], 255)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_KCOS)
+    return max(contours, key=cv2.contourArea)
+
+
+class TestFindFingertips(unittest.TestCase):
+    
+    def test_matches_reference(self):
+        rng = np.random.default_rng(0)
+        detector = ImprovedHandDetector()
+        frame_shape = (480, 640, 3)
+        checked = 0
+        for _ in range(400):
+            contour = random_contour(rng, frame_shape[:2])
+            defects, _, hull_points = detector._get_defects_and_hull(contour)
+            if defects is None:
+                continue
+            fingertips, count = detector._find_fingertips(contour, defects, hull_points, frame_shape)
+            expected = reference_fingertips(contour, frame_shape)
+            self.assertEqual(fingertips, expected)
+            self.assertEqual(count, len(expected))
+            checked += 1
+        self.assertGreater(checked, 300)
+    
+    def test_no_defects(self):
+        detector = ImprovedHandDetector()
+        self.assertEqual(detector._find_fingertips(None, None, None, (480, 640, 3)), ([], 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
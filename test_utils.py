@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+import utils
+
+
+def make_landmarks(fingers_up, thumb_x_offset=10):
+    """Build (21, 3) landmarks [id, x, y] with the given fingers (thumb ... pinky) raised"""
+    landmarks = np.array([[i, 100, 100] for i in range(21)])
+    if fingers_up[0]:
+        landmarks[4, 1] += thumb_x_offset
+    else:
+        landmarks[4, 1] -= thumb_x_offset
+    for up, tip in zip(fingers_up[1:], utils.FINGER_TIPS):
+        landmarks[tip, 2] += -10 if up else 10
+    return landmarks
+
+
+class TestFingerCounting(unittest.TestCase):
+    
+    def setUp(self):
+        # Start each test without a cached analyze_fingers() result
+        utils.clear_cache()
+    
+    def test_no_hand(self):
+        self.assertEqual(utils.count_fingers(None), 0)
+        self.assertEqual(utils.count_fingers([]), 0)
+        self.assertEqual(utils.get_finger_status([]), utils.FingerStatus(False, False, False, False, False))
+        self.assertEqual(utils.finger_mask(None), 0)
+    
+    def test_open_hand(self):
+        landmarks = make_landmarks((1, 1, 1, 1, 1))
+        self.assertEqual(utils.count_fingers(landmarks.tolist()), 5)
+        self.assertEqual(utils.finger_mask(landmarks), utils.OPEN_HAND)
+        self.assertEqual(utils.count_fingers_xy(landmarks[:, 1], landmarks[:, 2]), 5)
+    
+    def test_peace_sign(self):
+        landmarks = make_landmarks((0, 1, 1, 0, 0))
+        self.assertEqual(utils.count_fingers(landmarks), 2)
+        self.assertEqual(utils.get_finger_status(landmarks), utils.FingerStatus(False, True, True, False, False))
+        self.assertEqual(utils.finger_mask(landmarks), utils.PEACE_SIGN)
+    
+    def test_list_of_ndarray_rows(self):
+        # Rows that are NumPy arrays compare to np.bool_, which must still be summed
+        for dtype in (np.int64, np.float32):
+            landmarks = list(make_landmarks((1, 1, 1, 1, 1)).astype(dtype))
+            utils.clear_cache()
+            count, status = utils.analyze_fingers(landmarks)
+            self.assertEqual(count, 5)
+            self.assertIs(type(count), int)
+            self.assertTrue(all(type(up) is bool for up in status))
+            mask = utils.finger_mask(landmarks)
+            self.assertEqual(mask, utils.OPEN_HAND)
+            self.assertIs(type(mask), int)
+    
+    def test_cache(self):
+        landmarks = make_landmarks((0, 1, 1, 0, 0)).tolist()
+        result = utils.analyze_fingers(landmarks)
+        self.assertIs(utils.analyze_fingers(landmarks), result)
+        utils.clear_cache()
+        self.assertIsNot(utils.analyze_fingers(landmarks), result)
+        self.assertEqual(utils.analyze_fingers(landmarks), result)
+    
+    def test_left_hand(self):
+        landmarks = make_landmarks((1, 0, 0, 0, 0))
+        self.assertEqual(utils.count_fingers(landmarks, handedness_sign=-1), 0)
+        self.assertEqual(utils.finger_mask(landmarks, handedness_sign=-1), utils.FIST)
+        self.assertEqual(utils.count_fingers_xy(landmarks[:, 1], landmarks[:, 2], handedness_sign=-1), 0)
+    
+    def test_unsigned_coordinates(self):
+        # Thumb tip left of its joint: down for a right hand, up for a left hand
+        landmarks = make_landmarks((0, 0, 0, 0, 0)).astype(np.uint16)
+        for sign, expected in ((1, 0), (-1, 1)):
+            utils.clear_cache()
+            self.assertEqual(utils.count_fingers(list(landmarks), sign), expected)
+            self.assertEqual(utils.finger_mask(list(landmarks), sign), expected)
+            self.assertEqual(utils.count_fingers_xy(landmarks[:, 1], landmarks[:, 2], sign), expected)
+            self.assertEqual(utils.count_fingers_batch(landmarks[None], handedness_sign=sign)[0], expected)
+    
+    def test_batch_out(self):
+        batch = np.stack([make_landmarks((0, 1, 0, 0, 0))] * 3)
+        out = np.zeros(len(batch), dtype=np.int32)
+        self.assertIs(utils.count_fingers_batch(batch, out), out)
+        np.testing.assert_array_equal(out, [1, 1, 1])
+        with self.assertRaises(TypeError):
+            utils.count_fingers_batch(batch, out, -1)
+    
+    def test_variants_agree(self):
+        rng = np.random.default_rng(0)
+        batch = rng.integers(0, 500, (500, 21, 3))
+        signs = rng.choice([-1, 1], len(batch))
+        counts = utils.count_fingers_batch(batch, handedness_sign=signs)
+        for landmarks, sign, count in zip(batch, signs, counts):
+            sign = int(sign)
+            self.assertEqual(utils.count_fingers(landmarks.tolist(), sign), count)
+            self.assertEqual(utils.finger_count(utils.finger_mask(landmarks, sign)), count)
+            self.assertEqual(utils.count_fingers_xy(landmarks[:, 1], landmarks[:, 2], sign), count)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
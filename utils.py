@@ -1,79 +1,235 @@
-def count_fingers(landmarks):
+from typing import NamedTuple
+
+import numpy as np
+
+# MediaPipe hand landmark indexes (each finger runs from its base to its tip)
+MP_HAND_LANDMARKS = {
+    "wrist": 0,
+    "thumb_cmc": 1, "thumb_mcp": 2, "thumb_ip": 3, "thumb_tip": 4,
+    "index_mcp": 5, "index_pip": 6, "index_dip": 7, "index_tip": 8,
+    "middle_mcp": 9, "middle_pip": 10, "middle_dip": 11, "middle_tip": 12,
+    "ring_mcp": 13, "ring_pip": 14, "ring_dip": 15, "ring_tip": 16,
+    "pinky_mcp": 17, "pinky_pip": 18, "pinky_dip": 19, "pinky_tip": 20,
+}
+
+# Landmarks used by the finger tests: the thumb tip against its IP joint, and the
+# tip against the middle (PIP) joint for the index, middle, ring and pinky fingers
+THUMB_TIP = MP_HAND_LANDMARKS["thumb_tip"]
+THUMB_IP = MP_HAND_LANDMARKS["thumb_ip"]
+FINGER_TIPS = np.array([MP_HAND_LANDMARKS[f"{finger}_tip"] for finger in ("index", "middle", "ring", "pinky")])
+FINGER_PIPS = np.array([MP_HAND_LANDMARKS[f"{finger}_pip"] for finger in ("index", "middle", "ring", "pinky")])
+
+# The same indexes as plain ints for the single-hand functions (indexing a list
+# with a NumPy integer is slower than with an int)
+_INDEX_TIP, _MIDDLE_TIP, _RING_TIP, _PINKY_TIP = FINGER_TIPS.tolist()
+_INDEX_PIP, _MIDDLE_PIP, _RING_PIP, _PINKY_PIP = FINGER_PIPS.tolist()
+
+# Bit of each finger in a finger_mask() value
+FINGER_BITS = {"thumb": 0b00001, "index": 0b00010, "middle": 0b00100, "ring": 0b01000, "pinky": 0b10000}
+
+# Common gestures as finger masks
+FIST = 0b00000
+THUMBS_UP = 0b00001
+POINTING = 0b00010
+PEACE_SIGN = 0b00110
+OPEN_HAND = 0b11111
+
+
+class FingerStatus(NamedTuple):
+    """Status of each finger (True for up, False for down)"""
+    thumb: bool
+    index: bool
+    middle: bool
+    ring: bool
+    pinky: bool
+
+
+# Shared status and analyze_fingers() result for frames without a hand
+# (immutable, so safe to reuse; no-hand frames allocate nothing)
+_ALL_DOWN = FingerStatus(False, False, False, False, False)
+_NO_HAND = (0, _ALL_DOWN)
+
+# Last analyze_fingers() call as (coordinates read, result), kept in a single
+# tuple so it is replaced atomically; a hit needs the exact same coordinates, so
+# sharing it between hands or threads only costs misses, never wrong results
+_last_analysis = (None, _NO_HAND)
+
+
+def clear_cache():
+    """Forget the last analyze_fingers() result, e.g. when switching to another video source"""
+    global _last_analysis
+    _last_analysis = (None, _NO_HAND)
+
+
+def analyze_fingers(landmarks, handedness_sign=1):
     """
-    Count the number of raised fingers based on hand landmarks.
-    
-    MediaPipe hand landmark indexes:
-    - Wrist: 0
-    - Thumb: 1 (base) to 4 (tip)
-    - Index: 5 (base) to 8 (tip)
-    - Middle: 9 (base) to 12 (tip)
-    - Ring: 13 (base) to 16 (tip)
-    - Pinky: 17 (base) to 20 (tip)
+    Count the raised fingers and get the status of each finger in one pass.
     
     Args:
-        landmarks (list): List of landmark positions [id, x, y].
-        
+        landmarks (list or np.ndarray): Landmark positions [id, x, y] as a list
+            or a (21, 3) array, ordered by id as MediaPipe returns them
+            (landmarks[i][0] == i, see MP_HAND_LANDMARKS).
+        handedness_sign (int): 1 for a right hand, -1 for a left hand (e.g. -1 when
+            MediaPipe's handedness label is "Left"); mirrors the thumb test.
+    
     Returns:
-        int: Number of raised fingers (0-5).
+        tuple: Number of raised fingers (0-5) and the FingerStatus of each finger.
     """
-    # If no hand landmarks detected, return 0
-    if not landmarks:
-        return 0
+    # If no hand landmarks detected, all fingers are down
+    if landmarks is None or len(landmarks) == 0:
+        return _NO_HAND
+    
+    # For a single hand, NumPy's per-call dispatch costs more than the five
+    # comparisons themselves, so arrays are unpacked to plain lists (one C-level
+    # call) and compared as Python scalars
+    if isinstance(landmarks, np.ndarray):
+        landmarks = landmarks.tolist()
     
-    # Convert landmarks to a dictionary for easier access
-    landmarks_dict = {landmark[0]: (landmark[1], landmark[2]) for landmark in landmarks}
+    # Only these 10 coordinates are read; a held pose repeats them exactly, in
+    # which case the previous result is returned as is
+    global _last_analysis
+    key = (handedness_sign, landmarks[THUMB_IP][1], landmarks[THUMB_TIP][1],
+           landmarks[_INDEX_PIP][2], landmarks[_INDEX_TIP][2], landmarks[_MIDDLE_PIP][2], landmarks[_MIDDLE_TIP][2],
+           landmarks[_RING_PIP][2], landmarks[_RING_TIP][2], landmarks[_PINKY_PIP][2], landmarks[_PINKY_TIP][2])
+    last_key, last_result = _last_analysis
+    if key == last_key:
+        return last_result
+    (_, thumb_ip_x, thumb_tip_x, index_pip_y, index_tip_y, middle_pip_y, middle_tip_y,
+     ring_pip_y, ring_tip_y, pinky_pip_y, pinky_tip_y) = key
     
-    fingers = 0
+    # Each test is wrapped in bool(): rows that are NumPy arrays yield np.bool_,
+    # for which + is a logical OR rather than a sum
     
     # Thumb (special case) - compare x-coordinates
-    # Thumb is considered up if the tip (4) is to the right of the joint (3) for right hand
-    # For a more robust solution, you would need to consider hand chirality (left/right hand)
-    if landmarks_dict[4][0] > landmarks_dict[3][0]:
-        fingers += 1
+    # Thumb is considered up if the tip is to the right of its joint for a right
+    # hand and to the left for a left hand (compared rather than subtracted, so
+    # unsigned coordinates can't wrap around)
+    thumb_up = bool(thumb_tip_x > thumb_ip_x if handedness_sign > 0 else thumb_tip_x < thumb_ip_x)
     
     # For fingers 2-5, check if the fingertip y-coordinate is above the middle joint
     # Lower y-coordinate value means higher position on the screen
-    # Index finger (tip: 8, middle joint: 6)
-    if landmarks_dict[8][1] < landmarks_dict[6][1]:
-        fingers += 1
+    index_up = bool(index_tip_y < index_pip_y)
+    middle_up = bool(middle_tip_y < middle_pip_y)
+    ring_up = bool(ring_tip_y < ring_pip_y)
+    pinky_up = bool(pinky_tip_y < pinky_pip_y)
     
-    # Middle finger (tip: 12, middle joint: 10)
-    if landmarks_dict[12][1] < landmarks_dict[10][1]:
-        fingers += 1
+    finger_status = FingerStatus(thumb_up, index_up, middle_up, ring_up, pinky_up)
+    result = (thumb_up + index_up + middle_up + ring_up + pinky_up, finger_status)
+    _last_analysis = (key, result)
     
-    # Ring finger (tip: 16, middle joint: 14)
-    if landmarks_dict[16][1] < landmarks_dict[14][1]:
-        fingers += 1
+    return result
+
+
+def count_fingers(landmarks, handedness_sign=1):
+    """
+    Count the number of raised fingers based on hand landmarks.
     
-    # Pinky finger (tip: 20, middle joint: 18)
-    if landmarks_dict[20][1] < landmarks_dict[18][1]:
-        fingers += 1
+    Args:
+        landmarks (list or np.ndarray): Landmark positions, see analyze_fingers.
+        handedness_sign (int): 1 for a right hand, -1 for a left hand, see analyze_fingers.
     
-    return fingers
+    Returns:
+        int: Number of raised fingers (0-5).
+    """
+    return analyze_fingers(landmarks, handedness_sign)[0]
 
 
-def get_finger_status(landmarks):
+def get_finger_status(landmarks, handedness_sign=1):
     """
     Get the status of each finger (up or down).
     
     Args:
-        landmarks (list): List of landmark positions [id, x, y].
-        
+        landmarks (list or np.ndarray): Landmark positions, see analyze_fingers.
+        handedness_sign (int): 1 for a right hand, -1 for a left hand, see analyze_fingers.
+    
+    Returns:
+        FingerStatus: Status of each finger (True for up, False for down);
+            use ._asdict() where a dictionary is needed.
+    """
+    return analyze_fingers(landmarks, handedness_sign)[1]
+
+
+def count_fingers_xy(xs, ys, handedness_sign=1):
+    """
+    Count the raised fingers from landmark coordinates stored as two parallel
+    arrays (xs[i], ys[i] for landmark i), so a landmark callback can fill
+    reused buffers instead of building an [id, x, y] list per landmark.
+    
+    Args:
+        xs (list or np.ndarray): x-coordinates of the 21 landmarks, ordered by id.
+        ys (list or np.ndarray): y-coordinates of the 21 landmarks, ordered by id.
+        handedness_sign (int): 1 for a right hand, -1 for a left hand, see analyze_fingers.
+    
+    Returns:
+        int: Number of raised fingers (0-5).
+    """
+    # Thumb tip outside its joint; other fingertips above their middle joint
+    thumb_up = xs[THUMB_TIP] > xs[THUMB_IP] if handedness_sign > 0 else xs[THUMB_TIP] < xs[THUMB_IP]
+    return (int(thumb_up) + int(ys[_INDEX_TIP] < ys[_INDEX_PIP]) + int(ys[_MIDDLE_TIP] < ys[_MIDDLE_PIP])
+            + int(ys[_RING_TIP] < ys[_RING_PIP]) + int(ys[_PINKY_TIP] < ys[_PINKY_PIP]))
+
+
+def finger_mask(landmarks, handedness_sign=1):
+    """
+    Encode which fingers are up as a bitmask (bit 0 thumb ... bit 4 pinky, see
+    FINGER_BITS), so a gesture check is a single integer comparison such as
+    finger_mask(landmarks) == PEACE_SIGN.
+    
+    Args:
+        landmarks (list or np.ndarray): Landmark positions, see analyze_fingers.
+        handedness_sign (int): 1 for a right hand, -1 for a left hand, see analyze_fingers.
+    
+    Returns:
+        int: Finger bitmask (0 when no hand is detected).
+    """
+    if landmarks is None or len(landmarks) == 0:
+        return 0
+    
+    if isinstance(landmarks, np.ndarray):
+        landmarks = landmarks.tolist()
+    
+    # Same tests as analyze_fingers, combined into one integer (int() since rows
+    # that are NumPy arrays would otherwise give a NumPy integer)
+    thumb_tip_x, thumb_ip_x = landmarks[THUMB_TIP][1], landmarks[THUMB_IP][1]
+    thumb_up = thumb_tip_x > thumb_ip_x if handedness_sign > 0 else thumb_tip_x < thumb_ip_x
+    return int(thumb_up
+               | (landmarks[_INDEX_TIP][2] < landmarks[_INDEX_PIP][2]) << 1
+               | (landmarks[_MIDDLE_TIP][2] < landmarks[_MIDDLE_PIP][2]) << 2
+               | (landmarks[_RING_TIP][2] < landmarks[_RING_PIP][2]) << 3
+               | (landmarks[_PINKY_TIP][2] < landmarks[_PINKY_PIP][2]) << 4)
+
+
+def finger_count(mask):
+    """Return the number of raised fingers in a finger_mask() value"""
+    return bin(mask).count("1")
+
+
+def count_fingers_batch(landmarks_batch, out=None, *, handedness_sign=1):
+    """
+    Count the raised fingers for a batch of hands in one vectorized pass,
+    e.g. for recorded video or a queue of buffered frames.
+    
+    Args:
+        landmarks_batch (np.ndarray): (N, 21, 3) array of landmark positions [id, x, y].
+        out (np.ndarray, optional): (N,) int32 array to write the counts into,
+            so a buffer can be reused across calls.
+        handedness_sign (int or np.ndarray): 1 for right hands, -1 for left hands,
+            either for the whole batch or as an (N,) array (keyword only).
+    
     Returns:
-        dict: Dictionary with status of each finger (True for up, False for down).
+        np.ndarray: (N,) int32 array with the number of raised fingers (0-5) per hand.
     """
-    if not landmarks:
-        return {"thumb": False, "index": False, "middle": False, "ring": False, "pinky": False}
+    landmarks_batch = np.asarray(landmarks_batch)
+    if out is None:
+        out = np.empty(len(landmarks_batch), dtype=np.int32)
     
-    # Convert landmarks to a dictionary for easier access
-    landmarks_dict = {landmark[0]: (landmark[1], landmark[2]) for landmark in landmarks}
+    # Fingers 2-5: fingertip above the middle joint
+    fingers_up = landmarks_batch[:, FINGER_TIPS, 2] < landmarks_batch[:, FINGER_PIPS, 2]
+    np.sum(fingers_up, axis=1, dtype=np.int32, out=out)
     
-    finger_status = {
-        "thumb": landmarks_dict[4][0] > landmarks_dict[3][0],  # Thumb is up if tip is to the right of joint
-        "index": landmarks_dict[8][1] < landmarks_dict[6][1],  # Other fingers are up if tip is above middle joint
-        "middle": landmarks_dict[12][1] < landmarks_dict[10][1],
-        "ring": landmarks_dict[16][1] < landmarks_dict[14][1],
-        "pinky": landmarks_dict[20][1] < landmarks_dict[18][1]
-    }
+    # Thumb: tip outside the joint (to the right for right hands); compared rather
+    # than subtracted, so unsigned coordinates can't wrap around
+    thumb_x, joint_x = landmarks_batch[:, THUMB_TIP, 1], landmarks_batch[:, THUMB_IP, 1]
+    out += np.where(np.asarray(handedness_sign) > 0, thumb_x > joint_x, thumb_x < joint_x)
     
-    return finger_status
\ No newline at end of file
+    return out
\ No newline at end of file